@@ -1,5 +1,10 @@
+import argparse
+import hashlib
 import json
+import os
 import re
+import sys
+import tempfile
 import unicodedata
 from jinja2 import Environment, FileSystemLoader
 from pathlib import Path
@@ -10,6 +15,15 @@ import rjsmin
 import rcssmin
 from typing import Optional
 
+from fragment_cache import FragmentCache, FragmentCacheExtension, templates_hash
+from icon_subset import build_icon_subset
+from media_meta import MediaMetaCache
+from perf_budget import run as check_performance_budgets
+from pipeline import BackgroundWriter, JsonArrayStreamWriter
+from sharding import (
+    ShardMergeError, asset_key, merge_partials, page_key, parse_shard, assign_shards, write_manifest,
+)
+
 # =========================
 # Paths
 # =========================
@@ -21,6 +35,39 @@ STATIC_DST = DIST_DIR / 'static'
 DATA_FILE = BASE_DIR / 'data' / 'portfolio.json'
 TAGS_FILE = BASE_DIR / 'data' / 'tags.json'
 CATEGORIES_FILE = BASE_DIR / 'data' / 'categories.json'
+CACHE_DIR = BASE_DIR / '.cache'
+BUDGETS_FILE = BASE_DIR / 'data' / 'budgets.json'
+
+# =========================
+# CLI (sharding)
+# =========================
+parser = argparse.ArgumentParser(description='Build the static portfolio site into dist/')
+parser.add_argument('--out', '-o', default=None, help='Output directory (default: dist/)')
+mode = parser.add_mutually_exclusive_group()
+mode.add_argument('--shard', type=parse_shard, default=None, metavar='I/N',
+                  help='Build only shard I of N (1-based): partial output + shard-manifest.json')
+mode.add_argument('--merge', type=Path, nargs='+', default=None, metavar='DIR',
+                  help='Merge partial shard outputs and write the final index.html/index.json')
+parser.add_argument('--skip-budgets', action='store_true', help='Do not enforce data/budgets.json after the build')
+args = parser.parse_args()
+
+if args.out:
+    DIST_DIR = Path(args.out).resolve()
+    STATIC_DST = DIST_DIR / 'static'
+SHARD = args.shard
+MERGE_DIRS = args.merge
+# Global assets (icon fonts, robots.txt) belong to shard 1; `--merge` takes them from its partial
+OWNS_GLOBAL_ASSETS = MERGE_DIRS is None and (SHARD is None or SHARD[0] == 1)
+# key -> shard, filled once the pages are known (see `assign_shards`)
+SHARD_ASSIGNMENT = {}
+
+
+def owns(key: str) -> bool:
+    """True if this process must build `key` (always, unless running `--shard`)."""
+    if MERGE_DIRS is not None:
+        return False
+    return SHARD is None or SHARD_ASSIGNMENT[key] == SHARD[0]
+
 
 # Load data
 with open(DATA_FILE, 'r', encoding='utf-8') as f:
@@ -44,9 +91,11 @@ portfolio_data['categories_map'] = categories_data
 env = Environment(
     loader=FileSystemLoader(str(TEMPLATES_DIR)),
     autoescape=True,
+    extensions=[FragmentCacheExtension],
 )
 
-BUILD_TS = int(time.time())
+# SOURCE_DATE_EPOCH lets every shard of a build share the same cache-busting value
+BUILD_TS = int(os.environ.get('SOURCE_DATE_EPOCH') or time.time())
 def static(path: str) -> str:
     # Ruta relativa para GitHub Pages
     return f'static/{path}?v={BUILD_TS}'
@@ -122,6 +171,40 @@ def resolve_static_media(project_slug: str, media_path: str, project_id: Optiona
     return media_path
 
 
+media_cache = MediaMetaCache(CACHE_DIR / 'media-meta.json')
+
+
+def local_media_meta(media_path: str) -> dict:
+    """Metadatos de `media_path` si es un archivo local (`static/...`); `{}` si no."""
+    if not media_path or not media_path.startswith('static/'):
+        return {}
+    return media_cache.get(BASE_DIR / media_path) or {}
+
+
+def attach_media_meta(target: dict, media_path: str, prefix: str = '', placeholder: bool = True):
+    """Copia en `target` las dimensiones intrínsecas (y el placeholder LQIP si existe)
+    del archivo local `media_path`. Las URLs externas o archivos inexistentes se ignoran.
+    Con `prefix='preview_'` las claves quedan como `preview_width`, `preview_height`, ...
+    """
+    for key, value in local_media_meta(media_path).items():
+        if placeholder or key != 'placeholder':
+            target[f'{prefix}{key}'] = value
+
+
+# Placeholders (data URIs) only belong in a page's own `project-data` and in
+# index.json; `site-data` is embedded in every page, so it leaves them out.
+PLACEHOLDER_KEYS = {'placeholder', 'video_placeholder'}
+
+
+def without_placeholders(obj):
+    """Copia de `obj` sin las claves de `PLACEHOLDER_KEYS` (a cualquier profundidad)."""
+    if isinstance(obj, dict):
+        return {k: without_placeholders(v) for k, v in obj.items() if k not in PLACEHOLDER_KEYS}
+    if isinstance(obj, list):
+        return [without_placeholders(v) for v in obj]
+    return obj
+
+
 def validate_and_normalize_project(project: dict, lang_code: str):
     """Validaciones sencillas y normalizaciones sobre cada proyecto.
     Añade `slug` si falta, advierte si faltan campos importantes y devuelve el objeto.
@@ -165,130 +248,250 @@ DIST_DIR.mkdir(exist_ok=True)
 projects_dir = DIST_DIR / 'projects'
 projects_dir.mkdir(parents=True, exist_ok=True)
 
-# Collect a lightweight index for client-side search/filters
-index_list = []
+# =========================
+# Icon font subset (self-hosted, fingerprinted)
+# =========================
+# Must run before rendering: base.html links the fingerprinted CSS. If the
+# subset cannot be built, `icon_assets` is None and base.html uses the CDN.
+ICON_SCAN_PATHS = [TEMPLATES_DIR, STATIC_SRC / 'js', BASE_DIR / 'data']
+if OWNS_GLOBAL_ASSETS:
+    icon_assets = build_icon_subset(BASE_DIR, ICON_SCAN_PATHS, STATIC_DST / 'fonts', 'static/fonts')
+else:
+    # Other shards only need the URLs: the subset is deterministic, so the
+    # fingerprints match the files written by shard 1.
+    with tempfile.TemporaryDirectory() as tmp:
+        icon_assets = build_icon_subset(BASE_DIR, ICON_SCAN_PATHS, Path(tmp), 'static/fonts')
+env.globals['icon_assets'] = icon_assets
+
+# Fragment cache ({% cache %} in templates): the salt covers the templates and the
+# rendering code (this file: static(), globals, render calls). Per-build values such
+# as static() URLs and icon_assets are explicit inputs of the fragments that use them,
+# so a new BUILD_TS does not discard the whole cache.
+env.fragment_cache = FragmentCache(
+    salt=templates_hash(TEMPLATES_DIR, [Path(__file__)]),
+    path=CACHE_DIR / 'fragments.json',
+)
 
 # =========================
 # 1. Render Project Detail Pages
 # =========================
+# Streaming pipeline: render → minify are generators, so only one page is in
+# flight per stage; writes go to a background thread through a
+# bounded queue (I/O overlaps with rendering) and index.json is streamed out.
 template_project = env.get_template('project.html')
 
-for lang_code, content in portfolio_data['languages'].items():
-    for project in content['projects']:
-        # Validate and normalize
-        project = validate_and_normalize_project(project, lang_code)
-
-        project_slug = project.get('slug') or slugify(project.get('title', 'untitled'))
-        filename = f"{project_slug}-{lang_code}.html"
-        
-        # Inyectamos la URL en el objeto para que el Index sepa a dónde linkear
-        project['detail_url'] = filename 
-
-        # Resolver rutas de imágenes y videos: permitir `static/img/<project_slug>/...`
-        # obtener project id si existe
-        project_id = project.get('id')
-
-        for img in project.get('images', []):
-            if isinstance(img, dict) and img.get('img_path'):
-                img['img_path'] = resolve_static_media(project_slug, img.get('img_path'), project_id)
-
-        if project.get('video_url'):
-            project['video_url'] = resolve_static_media(project_slug, project.get('video_url'), project_id)
-
-        # Build a flattened keywords list from `tech` or from `tech_stack` values
-        keywords = []
-        if isinstance(project.get('tech'), list) and project.get('tech'):
-            keywords.extend(project.get('tech'))
-        ts = project.get('tech_stack') or {}
-        if isinstance(ts, dict):
-            for k, v in ts.items():
-                if isinstance(v, list):
-                    keywords.extend(v)
-        # dedupe while preserving order
-        seen = set()
-        dedup = []
-        for k in keywords:
-            if k not in seen:
-                seen.add(k)
-                dedup.append(k)
-        project['keywords'] = dedup
-
-        project_html = template_project.render(
+# Max rendered pages waiting to be written
+PIPELINE_QUEUE_SIZE = 8
+
+
+def minify_page(html: str) -> str:
+    """Minify HTML but avoid removing processing instructions which some
+    validators rely on. This keeps files compact while preserving meta tags.
+    """
+    try:
+        return minify_html.minify(
+            html,
+            minify_js=True,
+            minify_css=True,
+            remove_processing_instructions=False
+        )
+    except Exception:
+        # If minifier fails for any reason, fall back to unminified HTML
+        return html
+
+
+def prepare_projects(languages: dict):
+    """Genera `(lang_code, project)` ya validados, con rutas de media resueltas,
+    `detail_url` y `keywords`. Los proyectos se modifican en sitio porque el index
+    (site-data) necesita los mismos campos.
+    """
+    for lang_code, content in languages.items():
+        for project in content['projects']:
+            # Validate and normalize
+            project = validate_and_normalize_project(project, lang_code)
+
+            project_slug = project.get('slug') or slugify(project.get('title', 'untitled'))
+            filename = f"{project_slug}-{lang_code}.html"
+
+            # Inyectamos la URL en el objeto para que el Index sepa a dónde linkear
+            project['detail_url'] = filename
+
+            # Resolver rutas de imágenes y videos: permitir `static/img/<project_slug>/...`
+            # obtener project id si existe
+            project_id = project.get('id')
+
+            for img in project.get('images', []):
+                if isinstance(img, dict) and img.get('img_path'):
+                    img['img_path'] = resolve_static_media(project_slug, img.get('img_path'), project_id)
+                    attach_media_meta(img, img['img_path'])
+
+            if project.get('video_url'):
+                project['video_url'] = resolve_static_media(project_slug, project.get('video_url'), project_id)
+                attach_media_meta(project, project['video_url'], prefix='video_')
+
+            # Imagen de vista previa (index, og:image): `preview_image` explícita o la primera imagen
+            if project.get('preview_image'):
+                project['preview_image'] = resolve_static_media(project_slug, project.get('preview_image'), project_id)
+            else:
+                first_img = project['images'][0] if project['images'] and isinstance(project['images'][0], dict) else {}
+                project['preview_image'] = first_img.get('img_path') or None
+            # Sin placeholder: suele ser images[0], que ya lo lleva en `project-data`;
+            # solo index.json lo necesita (ver build_index_entry)
+            attach_media_meta(project, project['preview_image'], prefix='preview_', placeholder=False)
+
+            # Build a flattened keywords list from `tech` or from `tech_stack` values
+            keywords = []
+            if isinstance(project.get('tech'), list) and project.get('tech'):
+                keywords.extend(project.get('tech'))
+            ts = project.get('tech_stack') or {}
+            if isinstance(ts, dict):
+                for k, v in ts.items():
+                    if isinstance(v, list):
+                        keywords.extend(v)
+            # dedupe while preserving order
+            seen = set()
+            dedup = []
+            for k in keywords:
+                if k not in seen:
+                    seen.add(k)
+                    dedup.append(k)
+            project['keywords'] = dedup
+
+            yield lang_code, project
+
+
+def owned_projects(items, page_names: list):
+    """Deja pasar solo las páginas de este shard. Todas se preparan igualmente
+    (el index necesita los datos completos) y `page_names` recibe las propias.
+    """
+    for lang_code, project in items:
+        if owns(page_key(lang_code, project['slug'])):
+            page_names.append(project['detail_url'])
+            yield lang_code, project
+
+
+def render_projects(items):
+    for lang_code, project in items:
+        html = template_project.render(
             project_data=project,
             data=portfolio_data,
             current_lang=lang_code
         )
+        yield lang_code, project, html
 
-        # Minify HTML but avoid removing processing instructions which some
-        # validators rely on. This keeps files compact while preserving meta tags.
-        try:
-            min_project_html = minify_html.minify(
-                project_html,
-                minify_js=True,
-                minify_css=True,
-                remove_processing_instructions=False
-            )
-        except Exception:
-            # If minifier fails for any reason, fall back to unminified HTML
-            min_project_html = project_html
-
-        (DIST_DIR / filename).write_text(min_project_html, encoding='utf-8')
-        print(f'✔ Generated Project Detail: {filename}')
-
-        # NOTE: per-project JSON files are intentionally NOT written anymore.
-        # The project detail pages embed their project JSON inline (see templates/project.html),
-        # so the `dist/projects/` JSON files are not required for the site to work.
-
-        # Add to index list (lightweight)
-        # produce a slightly richer index entry so the frontpage can show role/impact/preview
-        index_entry = {
-            'id': project.get('id'),
-            'slug': project_slug,
-            'title': project.get('title'),
-            'summary': project.get('summary', ''),
-            'short_summary': project.get('short_summary', ''),
-            'role': project.get('role', []),
-            'impact': project.get('impact', ''),
-            'metrics': project.get('metrics', {}),
-            'tech': project.get('tech', []) or project.get('tech_stack', {}),
-            'detail_url': project.get('detail_url'),
-            'repo_url': project.get('repo_url') or project.get('url'),
-            'demo_url': project.get('demo_url', ''),
-            'preview_image': (project.get('images') and project.get('images')[0] and project.get('images')[0].get('img_path')) or None,
-            'categories': project.get('categories', []),
-            'published': project.get('published', True),
-            'lang': lang_code,
-            'featured': project.get('featured', False),
-            'weight': project.get('weight', 0)
-        }
-        index_list.append(index_entry)
 
-# =========================
-# 2. Render Main Index
-# =========================
-template_index = env.get_template('index.html')
-index_html = template_index.render(
-    title=f"Portfolio | {portfolio_data['languages']['es']['name']}",
-    data=portfolio_data
-)
+def minify_projects(items):
+    for lang_code, project, html in items:
+        yield lang_code, project, minify_page(html)
 
-(DIST_DIR / 'index.html').write_text(
-    minify_html.minify(index_html, minify_js=True, minify_css=True, remove_processing_instructions=False),
-    encoding='utf-8'
-)
-print(f'✔ Rendered index.html')
-try:
-    (DIST_DIR / 'index.json').write_text(json.dumps(index_list, ensure_ascii=False, indent=2), encoding='utf-8')
-    print('✔ Wrote index.json')
-except Exception as e:
-    print(f"⚠ Failed to write index.json: {e}")
+
+def build_index_entry(project: dict, lang_code: str) -> dict:
+    """Entrada ligera de `index.json` para búsqueda/filtros en cliente.
+    Produce a slightly richer index entry so the frontpage can show role/impact/preview.
+    """
+    return {
+        'id': project.get('id'),
+        'slug': project.get('slug'),
+        'title': project.get('title'),
+        'summary': project.get('summary', ''),
+        'short_summary': project.get('short_summary', ''),
+        'role': project.get('role', []),
+        'impact': project.get('impact', ''),
+        'metrics': project.get('metrics', {}),
+        'tech': project.get('tech', []) or project.get('tech_stack', {}),
+        'detail_url': project.get('detail_url'),
+        'repo_url': project.get('repo_url') or project.get('url'),
+        'demo_url': project.get('demo_url', ''),
+        'preview_image': project.get('preview_image'),
+        'preview_width': project.get('preview_width'),
+        'preview_height': project.get('preview_height'),
+        'preview_placeholder': local_media_meta(project.get('preview_image')).get('placeholder'),
+        'categories': project.get('categories', []),
+        'published': project.get('published', True),
+        'lang': lang_code,
+        'featured': project.get('featured', False),
+        'weight': project.get('weight', 0)
+    }
+
+
+# Prepare every project before rendering so all pages embed the same, complete
+# data (site-data) and shared fragments can be keyed by a single `data_version`.
+# Projects are modified in place; `prepared` only holds references.
+prepared = list(prepare_projects(portfolio_data['languages']))
+if SHARD is not None:
+    # Pages and assets are balanced separately so each shard gets an even share of both
+    SHARD_ASSIGNMENT.update(assign_shards((page_key(lang_code, project['slug']) for lang_code, project in prepared), SHARD[1]))
+    SHARD_ASSIGNMENT.update(assign_shards(
+        (asset_key(f.relative_to(STATIC_SRC).as_posix()) for f in STATIC_SRC.rglob('*') if f.is_file()),
+        SHARD[1],
+    ))
+env.globals['data_version'] = hashlib.sha256(
+    json.dumps(portfolio_data, sort_keys=True, ensure_ascii=False).encode('utf-8')
+).hexdigest()
+env.globals['site_data'] = without_placeholders(portfolio_data)
+
+shard_pages = []
+
+with BackgroundWriter(max_pending=PIPELINE_QUEUE_SIZE) as writer:
+    if MERGE_DIRS is None:
+        # With --shard this is a partial index.json, combined by --merge
+        with JsonArrayStreamWriter(DIST_DIR / 'index.json') as index_out:
+            pages = minify_projects(render_projects(owned_projects(prepared, shard_pages)))
+            for lang_code, project, html in pages:
+                filename = project['detail_url']
+                writer.submit(DIST_DIR / filename, html)
+                print(f'✔ Generated Project Detail: {filename}')
+
+                # NOTE: per-project JSON files are intentionally NOT written anymore.
+                # The project detail pages embed their project JSON inline (see templates/project.html),
+                # so the `dist/projects/` JSON files are not required for the site to work.
+
+                index_out.append(build_index_entry(project, lang_code))
+        print(f'✔ Wrote index.json ({index_out.count} entries)')
+    else:
+        # --merge: prepare every project (index.html needs the data) and check
+        # that the partials cover every expected page and static asset exactly once.
+        expected_pages = [project['detail_url'] for _, project in prepared]
+        expected_files = [f'static/{p.relative_to(STATIC_SRC).as_posix()}' for p in STATIC_SRC.rglob('*') if p.is_file()]
+        try:
+            partial_indexes = merge_partials(MERGE_DIRS, DIST_DIR, expected_pages, expected_files)
+        except ShardMergeError as e:
+            print(f'✖ Shard merge failed: {e}', file=sys.stderr)
+            sys.exit(1)
+        print(f'✔ Merged {len(MERGE_DIRS)} shard outputs')
+
+        entries = {}
+        for partial_index in partial_indexes:
+            with open(partial_index, 'r', encoding='utf-8') as f:
+                for entry in json.load(f):
+                    entries[entry['detail_url']] = entry
+        with JsonArrayStreamWriter(DIST_DIR / 'index.json') as index_out:
+            for page in expected_pages:
+                index_out.append(entries[page])
+        print(f'✔ Wrote index.json ({index_out.count} entries)')
+
+    # =========================
+    # 2. Render Main Index
+    # =========================
+    if SHARD is None:
+        template_index = env.get_template('index.html')
+        index_html = template_index.render(
+            title=f"Portfolio | {portfolio_data['languages']['es']['name']}",
+            data=portfolio_data
+        )
+        writer.submit(DIST_DIR / 'index.html', minify_page(index_html))
+        print(f'✔ Rendered index.html')
+
+media_cache.save()
+env.fragment_cache.save()
+print(f'✔ Fragment cache: {env.fragment_cache.summary()}')
 
 # =========================
 # 3. Static Files
 # =========================
 STATIC_DST.mkdir(parents=True, exist_ok=True)
 for file_path in STATIC_SRC.rglob('*'):
-    if file_path.is_file():
+    if file_path.is_file() and owns(asset_key(file_path.relative_to(STATIC_SRC).as_posix())):
         relative_path = file_path.relative_to(STATIC_SRC)
         target_path = STATIC_DST / relative_path
         target_path.parent.mkdir(parents=True, exist_ok=True)
@@ -304,7 +507,7 @@ for file_path in STATIC_SRC.rglob('*'):
 
 # Copy robots.txt from data/ to dist/ so GitHub Pages receives it
 ROBOTS_SRC = BASE_DIR / 'data' / 'robots.txt'
-if ROBOTS_SRC.exists():
+if ROBOTS_SRC.exists() and OWNS_GLOBAL_ASSETS:
     try:
         shutil.copy2(ROBOTS_SRC, DIST_DIR / 'robots.txt')
         print('✔ Copied robots.txt to dist/')
@@ -320,4 +523,16 @@ if projects_dst.exists():
     except Exception as e:
         print(f"⚠ Failed to remove dist/projects/: {e}")
 
+# =========================
+# 4. Performance budgets (full or merged builds only)
+# =========================
+if SHARD is None and not args.skip_budgets:
+    if check_performance_budgets(DIST_DIR, BUDGETS_FILE, CACHE_DIR / 'perf-report.json') != 0:
+        print('\n✖ Build exceeds performance budgets (see data/budgets.json).', file=sys.stderr)
+        sys.exit(1)
+
+if SHARD is not None:
+    manifest_path = write_manifest(DIST_DIR, SHARD, shard_pages)
+    print(f'✔ Shard {SHARD[0]}/{SHARD[1]}: {len(shard_pages)} pages, manifest {manifest_path.name}')
+
 print('\n✅ Build completed successfully.')
\ No newline at end of file
@@ -12,22 +12,10 @@ Usage:
   python3 scripts/export_section.py --input data/portfolio.json --section projects
 """
 import argparse
-import json
 import os
 import sys
 
-
-def load_json(path):
-    with open(path, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-
-def write_json(path, data):
-    tmp = path + '.tmp'
-    with open(tmp, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-        f.write('\n')
-    os.replace(tmp, path)
+from json_io import load_json, write_json_if_changed
 
 
 def export_section(portfolio_path, section, out_path=None, dry_run=False):
@@ -50,9 +38,10 @@ def export_section(portfolio_path, section, out_path=None, dry_run=False):
         print('[dry-run] would write', out_path)
         return 0
 
-    os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
-    write_json(out_path, bundle)
-    print('Written:', out_path)
+    if write_json_if_changed(out_path, bundle):
+        print('Written:', out_path)
+    else:
+        print('Unchanged:', out_path)
     return 0
 
 
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Jinja fragment cache: `{% cache <inputs...> %} ... {% endcache %}`.
+
+A fragment is rendered once per distinct set of inputs and reused by every page
+that renders it again (e.g. the `base.html` head, or the per-language labels of
+`project.html`). The key is a SHA-256 of:
+
+- the cache salt (hash of the templates, the rendering code and this module),
+- the fragment location (`<template>:<line>`),
+- the JSON serialization of the inputs listed in the tag.
+
+Every value the fragment uses must be listed as an input, including per-build
+values such as `static()` URLs (they carry `?v=<BUILD_TS>`). Large shared objects
+should be passed as a precomputed version string (e.g. `data_version`), so the
+lookup does not serialize them for every page. Only cache fragments shared by
+several pages: a per-page fragment costs its key and never hits within a build.
+
+With `path` set, rendered fragments are also persisted between builds; entries
+not used during a build are dropped on `save()`.
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import jinja2
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+from json_io import write_bytes_atomic
+
+
+def templates_hash(template_dir: Path, sources: Iterable[Path] = ()) -> str:
+    """Salt for the cache: changes whenever a template, one of the `sources` (the
+    code that defines globals/filters and renders, e.g. build.py), this module or
+    the Jinja version changes. It must not depend on per-build values.
+    """
+    h = hashlib.sha256(jinja2.__version__.encode('utf-8'))
+    for f in sorted(template_dir.rglob('*')):
+        if f.is_file():
+            h.update(f.relative_to(template_dir).as_posix().encode('utf-8'))
+            h.update(f.read_bytes())
+    for f in [*sources, Path(__file__)]:
+        h.update(Path(f).read_bytes())
+    return h.hexdigest()
+
+
+class FragmentCache:
+    """In-memory fragment store, optionally persisted as JSON."""
+
+    def __init__(self, salt: str = '', path: Optional[Path] = None):
+        self.salt = salt
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, str] = {}
+        self._used = set()
+        if path and path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    payload = json.load(f)
+                if payload.get('salt') == salt:
+                    self._entries = payload.get('entries', {})
+            except Exception as e:
+                print(f"⚠ Ignoring unreadable fragment cache {path}: {e}")
+
+    def key(self, parts) -> str:
+        raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256((self.salt + '\0' + raw).encode('utf-8')).hexdigest()
+
+    def get_or_render(self, parts, render) -> Markup:
+        key = self.key(parts)
+        self._used.add(key)
+        if key in self._entries:
+            self.hits += 1
+            return Markup(self._entries[key])
+        self.misses += 1
+        rv = render()
+        self._entries[key] = str(rv)
+        return Markup(rv)
+
+    def save(self):
+        if not self.path:
+            return
+        entries = {k: v for k, v in self._entries.items() if k in self._used}
+        payload = json.dumps({'salt': self.salt, 'entries': entries}, ensure_ascii=False)
+        write_bytes_atomic(self.path, payload.encode('utf-8'))
+
+    def summary(self) -> str:
+        return f'{self.hits} hits, {self.misses} misses'
+
+
+class FragmentCacheExtension(Extension):
+    """Adds the `{% cache input1, input2, ... %}...{% endcache %}` tag.
+    The store is `environment.fragment_cache` (an in-memory FragmentCache by default).
+    """
+
+    tags = {'cache'}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(fragment_cache=FragmentCache())
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        inputs = [nodes.Const(f'{parser.name}:{lineno}'), parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            inputs.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        call = self.call_method('_render_cached', [nodes.List(inputs)])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render_cached(self, inputs, caller):
+        return self.environment.fragment_cache.get_or_render(inputs, caller)
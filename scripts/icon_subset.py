@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Self-hosted, subsetted Font Awesome icons.
+
+Instead of loading the full Font Awesome `all.min.css` (and its fonts) from a CDN,
+`scripts/build.py` calls `build_icon_subset()` which:
+
+1. scans templates, JS and data files for the `fa-*` classes actually used,
+2. subsets the Font Awesome webfonts to those glyphs (fontTools, WOFF2),
+3. writes a small CSS with only the needed style/icon rules,
+4. fingerprints every output (`<name>.<hash>.<ext>`) so they can be cached forever.
+
+The Font Awesome source is taken from `$FONTAWESOME_DIR`, the `fontawesomefree`
+Python package or `node_modules/@fortawesome/fontawesome-free` (first match).
+If no source or fontTools is available the function returns None and the
+templates fall back to the CDN stylesheet.
+
+Usage (report used icons without writing anything):
+  python3 scripts/icon_subset.py templates static/js data
+"""
+import hashlib
+import io
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+try:
+    from fontTools import subset as ft_subset
+    from fontTools.ttLib import TTFont
+except ImportError:  # fontTools is optional: the CDN stylesheet is used instead
+    ft_subset = None
+    TTFont = None
+
+SCAN_SUFFIXES = {'.html', '.js', '.json'}
+
+FA_CLASS_RE = re.compile(r'(?<![\w-])fa-[a-z0-9]+(?:-[a-z0-9]+)*')
+ICON_RULE_RE = re.compile(r'\.fa-([a-z0-9-]+):{1,2}before\s*\{\s*content:\s*"\\([0-9a-fA-F]+)"')
+
+# Style classes -> (font file stem, font-family, font-weight)
+STYLES = {
+    'solid': ('fa-solid-900', 'Font Awesome 6 Free', 900),
+    'regular': ('fa-regular-400', 'Font Awesome 6 Free', 400),
+    'brands': ('fa-brands-400', 'Font Awesome 6 Brands', 400),
+}
+STYLE_CLASSES = {
+    'fa-solid': 'solid', 'fas': 'solid',
+    'fa-regular': 'regular', 'far': 'regular',
+    'fa-brands': 'brands', 'fab': 'brands',
+}
+
+BASE_CSS = (
+    '.fa,.fas,.fa-solid,.far,.fa-regular,.fab,.fa-brands{'
+    '-moz-osx-font-smoothing:grayscale;-webkit-font-smoothing:antialiased;'
+    'display:var(--fa-display,inline-block);font-style:normal;font-variant:normal;'
+    'line-height:1;text-rendering:auto}\n'
+)
+
+
+def find_fontawesome_dir(base_dir: Path) -> Optional[Path]:
+    """Locate a Font Awesome Free distribution with `css/all.css` and `webfonts/`."""
+    candidates = []
+    if os.environ.get('FONTAWESOME_DIR'):
+        candidates.append(Path(os.environ['FONTAWESOME_DIR']))
+    try:
+        import fontawesomefree
+        candidates.append(Path(fontawesomefree.__file__).parent / 'static' / 'fontawesomefree')
+    except ImportError:
+        pass
+    candidates.append(base_dir / 'node_modules' / '@fortawesome' / 'fontawesome-free')
+
+    for c in candidates:
+        if (c / 'css' / 'all.css').exists() and (c / 'webfonts').is_dir():
+            return c
+    return None
+
+
+def scan_used_classes(paths: Iterable[Path]) -> Set[str]:
+    """Return every `fa-*`/`fas`/`fab`/`far` class referenced under `paths`."""
+    used: Set[str] = set()
+    for root in paths:
+        files = [root] if root.is_file() else sorted(p for p in root.rglob('*') if p.is_file())
+        for f in files:
+            if f.suffix not in SCAN_SUFFIXES:
+                continue
+            text = f.read_text(encoding='utf-8', errors='ignore')
+            used.update(FA_CLASS_RE.findall(text))
+            used.update(re.findall(r'(?<![\w-])(fa[srb])(?![\w-])', text))
+    return used
+
+
+def parse_icon_codepoints(css_text: str) -> Dict[str, int]:
+    """Map icon name (including aliases) -> codepoint from Font Awesome's `all.css`."""
+    icons: Dict[str, int] = {}
+    for name, code in ICON_RULE_RE.findall(css_text):
+        icons.setdefault(name, int(code, 16))
+    return icons
+
+
+def _fingerprint(name: str, ext: str, data: bytes) -> str:
+    return f'{name}.{hashlib.sha256(data).hexdigest()[:10]}.{ext}'
+
+
+def _subset_woff2(font_path: Path, codepoints: Set[int]) -> bytes:
+    # Keep the source timestamp so identical input yields identical bytes (stable fingerprints)
+    font = TTFont(str(font_path), recalcTimestamp=False)
+    options = ft_subset.Options()
+    options.flavor = 'woff2'
+    options.layout_features = []
+    options.name_IDs = []
+    options.notdef_outline = True
+    subsetter = ft_subset.Subsetter(options=options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    buf = io.BytesIO()
+    font.flavor = 'woff2'
+    font.save(buf)
+    return buf.getvalue()
+
+
+def build_icon_subset(base_dir: Path, scan_paths: List[Path], out_dir: Path, url_prefix: str) -> Optional[Dict]:
+    """Write the subset CSS/fonts to `out_dir` and return their public URLs:
+    `{'css': '<url_prefix>/icons.<hash>.css', 'fonts': [...], 'icons': [...]}`.
+    Returns None when fontTools or the Font Awesome source is unavailable.
+    """
+    if ft_subset is None:
+        print('⚠ fontTools not installed; using the Font Awesome CDN stylesheet.')
+        return None
+    fa_dir = find_fontawesome_dir(base_dir)
+    if fa_dir is None:
+        print('⚠ Font Awesome source not found; using the Font Awesome CDN stylesheet.')
+        return None
+
+    used = scan_used_classes(scan_paths)
+    css_text = (fa_dir / 'css' / 'all.css').read_text(encoding='utf-8')
+    codepoints = parse_icon_codepoints(css_text)
+
+    styles = sorted({STYLE_CLASSES[c] for c in used if c in STYLE_CLASSES})
+    icons = sorted(c for c in used if c not in STYLE_CLASSES and c[3:] in codepoints)
+    unknown = sorted(c for c in used if c not in STYLE_CLASSES and c[3:] not in codepoints)
+    if unknown:
+        print(f"⚠ Unsupported icon classes (not included in subset): {', '.join(unknown)}")
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    wanted = {codepoints[c[3:]] for c in icons}
+    font_urls = []
+    font_face_css = []
+    for style in styles:
+        stem, family, weight = STYLES[style]
+        data = _subset_woff2(fa_dir / 'webfonts' / f'{stem}.ttf', wanted)
+        fname = _fingerprint(stem, 'woff2', data)
+        (out_dir / fname).write_bytes(data)
+        font_urls.append(f'{url_prefix}/{fname}')
+        font_face_css.append(
+            f"@font-face{{font-family:'{family}';font-style:normal;font-weight:{weight};"
+            f"font-display:block;src:url({fname}) format(\"woff2\")}}\n"
+        )
+        selectors = ','.join(sorted(f'.{c}' for c, s in STYLE_CLASSES.items() if s == style))
+        font_face_css.append(f"{selectors}{{font-family:'{family}';font-weight:{weight}}}\n")
+
+    icon_css = ''.join(f'.{c}::before{{content:"\\{codepoints[c[3:]]:x}"}}\n' for c in icons)
+    css = BASE_CSS + ''.join(font_face_css) + icon_css
+    css_bytes = css.encode('utf-8')
+    css_name = _fingerprint('icons', 'css', css_bytes)
+    (out_dir / css_name).write_bytes(css_bytes)
+
+    print(f'✔ Icon subset: {len(icons)} icons, {len(font_urls)} fonts -> {css_name}')
+    return {'css': f'{url_prefix}/{css_name}', 'fonts': font_urls, 'icons': icons}
+
+
+def main():
+    paths = [Path(p) for p in (sys.argv[1:] or ['templates', 'static/js', 'data'])]
+    used = sorted(scan_used_classes(paths))
+    print('\n'.join(used))
+
+
+if __name__ == '__main__':
+    main()
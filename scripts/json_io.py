@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Shared JSON I/O for the data split/export tools.
+
+- `write_bytes_atomic()` replaces a file through a unique temp file next to it,
+  so concurrent writers (e.g. parallel `build.py --shard` runs sharing `.cache/`)
+  never clobber each other's temp file; the last `os.replace` wins.
+- `write_json_if_changed()` serializes with the repo's canonical format
+  (UTF-8, `ensure_ascii=False`, 2-space indent, trailing newline) and only replaces
+  the file (via `write_bytes_atomic()`) when the bytes differ.
+  Unchanged files keep their mtime, so downstream mtime/hash based caches stay valid.
+- `JsonBatchWriter` runs those writes on a thread pool and reports how many files
+  were written vs. skipped.
+
+Used by `split_projects.py`, `split_data.py` and `export_section.py`; the build
+caches (`media_meta.py`, `fragment_cache.py`, `perf_budget.py`) use `write_bytes_atomic()`.
+"""
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+
+def load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def dump_json_bytes(data) -> bytes:
+    return (json.dumps(data, ensure_ascii=False, indent=2) + '\n').encode('utf-8')
+
+
+def write_bytes_atomic(path, payload: bytes):
+    """Atomically replace `path` with `payload`, keeping its permissions (0644 if new)."""
+    path = os.fspath(path)
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except OSError:
+        mode = 0o644
+
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    # Unique temp name: concurrent writers never share a temp file
+    with tempfile.NamedTemporaryFile('wb', dir=directory, prefix=os.path.basename(path) + '.',
+                                     suffix='.tmp', delete=False) as f:
+        f.write(payload)
+    try:
+        # NamedTemporaryFile is created 0600; keep the usual/previous permissions
+        os.chmod(f.name, mode)
+        os.replace(f.name, path)
+    except BaseException:
+        os.unlink(f.name)
+        raise
+
+
+def write_json_if_changed(path, data) -> bool:
+    """Write `data` to `path` unless the file already holds the same bytes.
+    Returns True if the file was (re)written, False if it was left untouched.
+    """
+    payload = dump_json_bytes(data)
+    try:
+        if os.path.getsize(path) == len(payload):
+            with open(path, 'rb') as f:
+                if f.read() == payload:
+                    return False
+    except OSError:
+        pass  # missing/unreadable: write it
+
+    write_bytes_atomic(path, payload)
+    return True
+
+
+class JsonBatchWriter:
+    """Queue JSON writes on a thread pool; use as a context manager.
+
+        with JsonBatchWriter() as writer:
+            writer.submit('data/a.json', {...})
+        print(writer.summary())
+    """
+
+    def __init__(self, max_workers=None):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers or min(8, (os.cpu_count() or 1) + 4))
+        self._pending = []
+        self._by_path = {}
+        self.written: List[str] = []
+        self.skipped: List[str] = []
+
+    def submit(self, path, data):
+        # The same path submitted twice (e.g. duplicate project ids): wait for the
+        # earlier write so the last submission deterministically wins
+        previous = self._by_path.get(path)
+        if previous is not None:
+            print(f'Warning: {path} submitted more than once; last one wins', file=sys.stderr)
+            previous.result()
+        fut = self._pool.submit(write_json_if_changed, path, data)
+        self._by_path[path] = fut
+        self._pending.append((path, fut))
+
+    def close(self):
+        """Wait for every queued write; re-raises the first failure."""
+        try:
+            for path, fut in self._pending:
+                (self.written if fut.result() else self.skipped).append(path)
+        finally:
+            self._pending = []
+            self._by_path = {}
+            self._pool.shutdown(wait=True)
+
+    def summary(self) -> str:
+        return f'{len(self.written)} written, {len(self.skipped)} unchanged'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self._pool.shutdown(wait=True)
+            return False
+        self.close()
+        return False
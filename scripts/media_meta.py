@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Intrinsic dimensions and low-quality placeholders (LQIP) for media files.
+
+`scripts/build.py` calls `MediaMetaCache.get()` for every resolved image/video so that
+templates and the embedded project JSON can emit `width`/`height` (no layout
+shift) and a tiny blurred inline placeholder while the real file loads.
+
+Results are cached in `.cache/media-meta.json` keyed by the SHA-256 of the file
+content, so unchanged files are never decoded twice across builds.
+
+Image support requires Pillow; video dimensions use `ffprobe` when it is on PATH.
+If neither is available the build keeps working and simply omits the metadata.
+
+Usage (inspect a single file):
+  python3 scripts/media_meta.py static/img/1/brazo-render.jpg
+"""
+import base64
+import hashlib
+import io
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+from json_io import write_bytes_atomic
+
+try:
+    from PIL import Image, ImageFilter, ImageOps
+except ImportError:  # Pillow is optional: metadata is skipped for images
+    Image = None
+    ImageFilter = None
+    ImageOps = None
+
+# Bump when the cached payload or how it is computed changes, so stale entries are ignored
+CACHE_VERSION = 2
+
+IMAGE_EXTS = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
+VIDEO_EXTS = {'.mp4', '.webm', '.ogg'}
+
+# Longest side of the generated placeholder, in pixels
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_BLUR = 1
+
+
+def file_hash(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _image_meta(path: Path) -> Optional[Dict]:
+    if Image is None:
+        return None
+    with Image.open(path) as im:
+        # Apply EXIF orientation: browsers display the rotated image, so its
+        # size (and the placeholder) must match the displayed orientation
+        im = ImageOps.exif_transpose(im)
+        width, height = im.size
+        thumb = im.convert('RGB')
+        thumb.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+        thumb = thumb.filter(ImageFilter.GaussianBlur(PLACEHOLDER_BLUR))
+        buf = io.BytesIO()
+        thumb.save(buf, format='JPEG', quality=40, optimize=True)
+    placeholder = 'data:image/jpeg;base64,' + base64.b64encode(buf.getvalue()).decode('ascii')
+    return {'width': width, 'height': height, 'placeholder': placeholder}
+
+
+def _video_meta(path: Path) -> Optional[Dict]:
+    ffprobe = shutil.which('ffprobe')
+    if not ffprobe:
+        return None
+    out = subprocess.run(
+        [ffprobe, '-v', 'error', '-select_streams', 'v:0',
+         '-show_entries', 'stream=width,height', '-of', 'json', str(path)],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    streams = json.loads(out).get('streams') or []
+    if not streams:
+        return None
+    return {'width': int(streams[0]['width']), 'height': int(streams[0]['height'])}
+
+
+class MediaMetaCache:
+    """Content-hash keyed cache of media metadata persisted as JSON."""
+
+    def __init__(self, cache_path: Path):
+        self.cache_path = cache_path
+        self.entries: Dict[str, Dict] = {}
+        self.dirty = False
+        # Per-process memo so the same file referenced from several languages
+        # is hashed only once per build
+        self._by_path: Dict[Path, Optional[Dict]] = {}
+        self._warned = False
+        if cache_path.exists():
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    payload = json.load(f)
+                if payload.get('version') == CACHE_VERSION:
+                    self.entries = payload.get('entries', {})
+            except Exception as e:
+                print(f"⚠ Ignoring unreadable media cache {cache_path}: {e}")
+
+    def get(self, path: Path) -> Optional[Dict]:
+        """Return `{width, height[, placeholder]}` for `path`, or None if unknown."""
+        path = Path(path)
+        if path in self._by_path:
+            return self._by_path[path]
+
+        meta = None
+        suffix = path.suffix.lower()
+        if path.is_file() and (suffix in IMAGE_EXTS or suffix in VIDEO_EXTS):
+            digest = file_hash(path)
+            if digest in self.entries:
+                meta = self.entries[digest]
+            else:
+                if suffix in IMAGE_EXTS and Image is None and not self._warned:
+                    print('⚠ Pillow not installed; image dimensions/placeholders are skipped.')
+                    self._warned = True
+                try:
+                    meta = _image_meta(path) if suffix in IMAGE_EXTS else _video_meta(path)
+                except Exception as e:
+                    print(f"⚠ Could not read media metadata for {path}: {e}")
+                    meta = None
+                if meta is not None:
+                    self.entries[digest] = meta
+                    self.dirty = True
+
+        self._by_path[path] = meta
+        return meta
+
+    def save(self):
+        if not self.dirty:
+            return
+        payload = json.dumps({'version': CACHE_VERSION, 'entries': self.entries})
+        write_bytes_atomic(self.cache_path, payload.encode('utf-8'))
+        self.dirty = False
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__.strip().splitlines()[-1], file=sys.stderr)
+        sys.exit(2)
+    cache = MediaMetaCache(Path('.cache') / 'media-meta.json')
+    for arg in sys.argv[1:]:
+        meta = cache.get(Path(arg)) or {}
+        summary = {k: v for k, v in meta.items() if k != 'placeholder'}
+        if 'placeholder' in meta:
+            summary['placeholder_bytes'] = len(meta['placeholder'])
+        print(arg, json.dumps(summary))
+    cache.save()
+
+
+if __name__ == '__main__':
+    main()
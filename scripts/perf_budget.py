@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Performance budgets for the built site.
+
+Computes the weight of every HTML page in `dist/` (HTML bytes, inline JSON bytes,
+bytes per referenced asset type and request count), checks it against
+`data/budgets.json` and compares it with the previous report to highlight
+regressions. `scripts/build.py` runs it after every full build and fails when a
+budget is exceeded.
+
+Budget file structure:
+{
+  "pages": {"*": {"html_bytes": 60000, ...}, "index.html": {...overrides}},
+  "assets": {"image": 500000, "video": 8000000, ...},   # max bytes per single file
+  "regression_threshold_pct": 5
+}
+Page budgets are matched with fnmatch patterns; later matches override earlier ones.
+
+Usage:
+  python3 scripts/perf_budget.py --dist dist --budgets data/budgets.json
+"""
+import argparse
+import fnmatch
+import json
+import re
+import sys
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from json_io import write_bytes_atomic
+
+ASSET_TYPES = {
+    '.jpg': 'image', '.jpeg': 'image', '.png': 'image', '.gif': 'image',
+    '.webp': 'image', '.avif': 'image', '.svg': 'image',
+    '.mp4': 'video', '.webm': 'video', '.ogg': 'video',
+    '.woff2': 'font', '.woff': 'font', '.ttf': 'font',
+    '.js': 'script', '.css': 'style',
+}
+PAGE_METRICS = [
+    'html_bytes', 'inline_json_bytes', 'image_bytes', 'video_bytes',
+    'font_bytes', 'script_bytes', 'style_bytes', 'total_bytes', 'requests',
+]
+
+# Local asset paths inside the inline `project-data` JSON, which
+# project-detail.js turns into <img>/<video> (images[].img_path, video_url, ...)
+STATIC_REF_RE = re.compile(r'(?<![\w/.-])static/[\w@%+./-]+')
+
+
+class _PageParser(HTMLParser):
+    """Collects subresource URLs and the inline JSON scripts (by id)."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.urls: List[str] = []
+        self.inline_json_bytes = 0
+        self.json_blobs: Dict[str, str] = {}
+        self._json_id = None
+
+    def handle_starttag(self, tag, attrs):
+        a = dict(attrs)
+        if tag == 'link' and a.get('href') and (a.get('rel') or '').lower() in ('stylesheet', 'preload', 'icon', 'modulepreload'):
+            self.urls.append(a['href'])
+        elif tag in ('script', 'img', 'video', 'source', 'iframe') and a.get('src'):
+            self.urls.append(a['src'])
+        elif tag == 'script' and (a.get('type') or '').endswith('json'):
+            self._json_id = a.get('id') or ''
+            self.json_blobs.setdefault(self._json_id, '')
+
+    def handle_endtag(self, tag):
+        if tag == 'script':
+            self._json_id = None
+
+    def handle_data(self, data):
+        if self._json_id is not None:
+            self.inline_json_bytes += len(data.encode('utf-8'))
+            self.json_blobs[self._json_id] += data
+
+
+def _local_path(url: str) -> str:
+    return url.split('?', 1)[0].split('#', 1)[0]
+
+
+def _client_media(blobs: Dict[str, str]) -> Set[str]:
+    """Media that client JS loads from the inline JSON: every path in a detail
+    page's `project-data`, or the card media (video or preview image) of each
+    project in the index `site-data`.
+    """
+    if 'project-data' in blobs:
+        return set(STATIC_REF_RE.findall(blobs['project-data']))
+    refs: Set[str] = set()
+    try:
+        site = json.loads(blobs.get('site-data') or '{}')
+    except ValueError:
+        return refs
+    for content in (site.get('languages') or {}).values():
+        for project in (content or {}).get('projects') or []:
+            media = project.get('video_url') or project.get('preview_image')
+            if isinstance(media, str) and media.startswith('static/'):
+                refs.add(media)
+    return refs
+
+
+def page_weight(dist_dir: Path, page: Path) -> Dict:
+    html = page.read_text(encoding='utf-8')
+    parser = _PageParser()
+    parser.feed(html)
+
+    external: Set[str] = set()
+    local: Set[str] = set()
+    for url in parser.urls:
+        if url.startswith(('http://', 'https://', '//')):
+            external.add(url)
+        elif not url.startswith('data:'):
+            local.add(_local_path(url))
+    local.update(_local_path(m) for m in _client_media(parser.json_blobs))
+
+    weight = {m: 0 for m in PAGE_METRICS}
+    weight['html_bytes'] = len(html.encode('utf-8'))
+    weight['inline_json_bytes'] = parser.inline_json_bytes
+    resources = 0
+    for rel in sorted(local):
+        f = dist_dir / rel
+        if not f.is_file():
+            continue  # unresolved media path or external-only reference
+        kind = ASSET_TYPES.get(f.suffix.lower())
+        size = f.stat().st_size
+        if kind:
+            weight[f'{kind}_bytes'] += size
+        weight['total_bytes'] += size
+        resources += 1
+    weight['total_bytes'] += weight['html_bytes']
+    # The page itself + local subresources + third-party ones (sizes unknown)
+    weight['requests'] = 1 + resources + len(external)
+    return weight
+
+
+def page_budget(budgets: Dict, page_name: str) -> Dict:
+    merged = {}
+    for pattern, limits in budgets.get('pages', {}).items():
+        if fnmatch.fnmatch(page_name, pattern):
+            merged.update(limits)
+    return merged
+
+
+def build_report(dist_dir: Path) -> Dict:
+    pages = {p.relative_to(dist_dir).as_posix(): page_weight(dist_dir, p) for p in sorted(dist_dir.glob('*.html'))}
+    assets = {}
+    for f in sorted(dist_dir.rglob('*')):
+        kind = ASSET_TYPES.get(f.suffix.lower())
+        if f.is_file() and kind and f.parent != dist_dir:
+            assets[f.relative_to(dist_dir).as_posix()] = {'type': kind, 'bytes': f.stat().st_size}
+    return {'pages': pages, 'assets': assets}
+
+
+def check_budgets(report: Dict, budgets: Dict) -> List[str]:
+    violations = []
+    for name, weight in report['pages'].items():
+        for metric, limit in page_budget(budgets, name).items():
+            if metric in weight and weight[metric] > limit:
+                violations.append(f'{name}: {metric} {weight[metric]:,} > budget {limit:,}')
+    asset_limits = budgets.get('assets', {})
+    for name, info in report['assets'].items():
+        limit = asset_limits.get(info['type'])
+        if limit is not None and info['bytes'] > limit:
+            violations.append(f"{name}: {info['type']} {info['bytes']:,} B > budget {limit:,}")
+    return violations
+
+
+def diff_reports(current: Dict, previous: Dict, threshold_pct: float) -> List[Tuple[str, str, int, int]]:
+    """Return `(page, metric, before, after)` for metrics that grew more than `threshold_pct`."""
+    regressions = []
+    for name, weight in current['pages'].items():
+        before = previous.get('pages', {}).get(name)
+        if not before:
+            continue
+        for metric in PAGE_METRICS:
+            old, new = before.get(metric, 0), weight.get(metric, 0)
+            if new > old and (old == 0 or (new - old) * 100.0 / old > threshold_pct):
+                regressions.append((name, metric, old, new))
+    return regressions
+
+
+def run(dist_dir: Path, budgets_path: Path, report_path: Optional[Path] = None) -> int:
+    """Build the report, print regressions vs. the previous one and check budgets.
+    Returns 0 if every budget holds, 1 otherwise. The new report replaces the old one.
+    """
+    if not budgets_path.exists():
+        print(f'⚠ Budget file not found: {budgets_path}; skipping performance budgets.')
+        return 0
+    with open(budgets_path, 'r', encoding='utf-8') as f:
+        budgets = json.load(f)
+
+    report = build_report(dist_dir)
+
+    if report_path and report_path.exists():
+        try:
+            with open(report_path, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+        except Exception as e:
+            print(f'⚠ Ignoring unreadable previous report {report_path}: {e}')
+            previous = None
+        if previous:
+            regressions = diff_reports(report, previous, budgets.get('regression_threshold_pct', 5))
+            for name, metric, old, new in regressions:
+                print(f'▲ Regression {name}: {metric} {old:,} → {new:,} (+{new - old:,})')
+            if not regressions:
+                print('✔ No size regressions vs. previous build')
+    elif report_path:
+        # Visible in CI logs: tells a cold cache apart from a clean diff
+        print(f'⚠ No previous report at {report_path}; regression diff skipped (first build or cold cache).')
+
+    if report_path:
+        write_bytes_atomic(report_path, json.dumps(report, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    heaviest = max(report['pages'].items(), key=lambda kv: kv[1]['total_bytes'], default=None)
+    if heaviest:
+        print(f"✔ Page weight: {len(report['pages'])} pages, heaviest {heaviest[0]} "
+              f"({heaviest[1]['total_bytes']:,} B, {heaviest[1]['requests']} requests)")
+
+    violations = check_budgets(report, budgets)
+    for v in violations:
+        print(f'✖ Budget exceeded: {v}', file=sys.stderr)
+    return 1 if violations else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check dist/ against performance budgets')
+    parser.add_argument('--dist', '-d', default='dist', help='Built site directory')
+    parser.add_argument('--budgets', '-b', default='data/budgets.json', help='Budget file')
+    parser.add_argument('--report', '-r', default='.cache/perf-report.json',
+                        help='Report path; the previous report there is used for the regression diff')
+    args = parser.parse_args()
+
+    sys.exit(run(Path(args.dist), Path(args.budgets), Path(args.report) if args.report else None))
+
+
+if __name__ == '__main__':
+    main()
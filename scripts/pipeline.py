@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Streaming output helpers for `scripts/build.py`.
+
+- `BackgroundWriter` writes files on a worker thread fed by a bounded queue, so
+  disk I/O overlaps with rendering/minifying and at most `max_pending` rendered
+  pages are held in memory at any time.
+- `JsonArrayStreamWriter` writes a JSON array item by item (same output as
+  `json.dumps(items, ensure_ascii=False, indent=2)`) without building the list.
+"""
+import json
+import queue
+import threading
+from pathlib import Path
+from typing import Optional
+
+_SENTINEL = object()
+
+
+class BackgroundWriter:
+    """Write `(path, text)` pairs on a background thread; use as a context manager.
+    `submit()` blocks when `max_pending` writes are queued (back-pressure).
+    The first write error is re-raised from `submit()`/`close()`.
+    """
+
+    def __init__(self, max_pending: int = 8):
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._error: Optional[BaseException] = None
+        self.count = 0
+        self._thread = threading.Thread(target=self._run, name='dist-writer', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _SENTINEL:
+                return
+            if self._error is not None:
+                continue  # drain the queue after a failure
+            path, text = item
+            try:
+                Path(path).write_text(text, encoding='utf-8')
+                self.count += 1
+            except BaseException as e:
+                self._error = e
+
+    def _raise_pending_error(self):
+        if self._error is not None:
+            raise self._error
+
+    def submit(self, path, text: str):
+        self._raise_pending_error()
+        self._queue.put((path, text))
+
+    def close(self):
+        self._queue.put(_SENTINEL)
+        self._thread.join()
+        self._raise_pending_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self._queue.put(_SENTINEL)
+            self._thread.join()
+            return False
+        self.close()
+        return False
+
+
+class JsonArrayStreamWriter:
+    """Append items to a JSON array file one at a time."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.count = 0
+        self._f = None
+
+    def __enter__(self):
+        self._f = open(self.path, 'w', encoding='utf-8')
+        return self
+
+    def append(self, item):
+        body = json.dumps(item, ensure_ascii=False, indent=2).replace('\n', '\n  ')
+        self._f.write(('[\n  ' if self.count == 0 else ',\n  ') + body)
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        self._f.write('\n]' if self.count else '[]')
+        self._f.close()
+        return False
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Deterministic build sharding for `scripts/build.py`.
+
+`build.py --shard i/N --out DIR` renders only the (lang, project) pages and static
+assets assigned to shard `i` (1-based) and writes a partial output plus
+`shard-manifest.json`. Shard 1 also owns the global assets (icon fonts, robots.txt).
+`build.py --merge DIR...` copies every partial into `dist/`, checks that no file is
+produced by two shards and that no expected page/asset is missing, then writes the
+final `index.html` and `index.json`.
+
+Every shard sees the whole catalogue, so keys are assigned round-robin over their
+sorted order: each group (pages, assets) is split evenly (sizes differ by at most
+one) and every shard computes the same assignment on any machine or Python version.
+"""
+import argparse
+import json
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+MANIFEST_NAME = 'shard-manifest.json'
+# Partial index.json of a shard; merged into the final index.json
+PARTIAL_INDEX_NAME = 'index.json'
+
+
+class ShardMergeError(Exception):
+    pass
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse `i/N` (1 <= i <= N) for argparse."""
+    try:
+        i, n = (int(x) for x in spec.split('/', 1))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid shard '{spec}', expected i/N (e.g. 1/4)")
+    if n < 1 or not 1 <= i <= n:
+        raise argparse.ArgumentTypeError(f"invalid shard '{spec}': i must be between 1 and N")
+    return i, n
+
+
+def assign_shards(keys: Iterable[str], count: int) -> Dict[str, int]:
+    """Map each key to its 1-based shard, balanced round-robin over the sorted keys."""
+    return {key: i % count + 1 for i, key in enumerate(sorted(set(keys)))}
+
+
+def page_key(lang_code: str, slug: str) -> str:
+    return f'page:{lang_code}/{slug}'
+
+
+def asset_key(rel_path: str) -> str:
+    return f'asset:{rel_path}'
+
+
+def write_manifest(out_dir: Path, shard: Tuple[int, int], pages: List[str]) -> Path:
+    """Record every file of this partial output (except manifest/partial index)."""
+    files = sorted(
+        p.relative_to(out_dir).as_posix()
+        for p in out_dir.rglob('*')
+        if p.is_file() and p.relative_to(out_dir).as_posix() not in (MANIFEST_NAME, PARTIAL_INDEX_NAME)
+    )
+    manifest = {'shard': shard[0], 'of': shard[1], 'pages': sorted(pages), 'files': files}
+    path = out_dir / MANIFEST_NAME
+    path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8')
+    return path
+
+
+def merge_partials(partial_dirs: Iterable[Path], out_dir: Path,
+                   expected_pages: Iterable[str], expected_files: Iterable[str]) -> List[Path]:
+    """Copy the partial outputs into `out_dir` after validating the manifests.
+
+    Returns the partial index.json paths so the caller can assemble the final
+    index.json in canonical order. Raises ShardMergeError on a missing shard,
+    overlap (a file in two partials) or gap (an expected page/file in none).
+    """
+    manifests = []
+    for d in partial_dirs:
+        mpath = Path(d) / MANIFEST_NAME
+        if not mpath.exists():
+            raise ShardMergeError(f'{d}: missing {MANIFEST_NAME}')
+        with open(mpath, 'r', encoding='utf-8') as f:
+            manifests.append((Path(d), json.load(f)))
+
+    counts = {m['of'] for _, m in manifests}
+    if len(counts) != 1:
+        raise ShardMergeError(f'partials come from different shard counts: {sorted(counts)}')
+    count = counts.pop()
+    seen_shards = sorted(m['shard'] for _, m in manifests)
+    if seen_shards != list(range(1, count + 1)):
+        raise ShardMergeError(f'expected shards 1..{count} exactly once, got {seen_shards}')
+
+    owner: Dict[str, Path] = {}
+    overlaps = []
+    for d, m in manifests:
+        for rel in m['files']:
+            if rel in owner:
+                overlaps.append(f'{rel} ({owner[rel]} and {d})')
+            owner[rel] = d
+    if overlaps:
+        raise ShardMergeError('files produced by more than one shard:\n  ' + '\n  '.join(overlaps))
+
+    missing = sorted(set(expected_pages) - owner.keys()) + sorted(set(expected_files) - owner.keys())
+    if missing:
+        raise ShardMergeError('expected outputs missing from every shard:\n  ' + '\n  '.join(missing))
+
+    for rel, d in owner.items():
+        target = out_dir / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(d / rel, target)
+
+    return [d / PARTIAL_INDEX_NAME for d, _ in manifests]
@@ -16,22 +16,10 @@ Usage:
 It is intentionally generic so you can use it later for other bundle files.
 """
 import argparse
-import json
 import os
 import sys
 
-
-def load_json(path):
-    with open(path, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-
-def write_json(path, data):
-    tmp = path + '.tmp'
-    with open(tmp, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-        f.write('\n')
-    os.replace(tmp, path)
+from json_io import JsonBatchWriter, load_json
 
 
 def split_bundle(input_path, out_root='data', dry_run=False):
@@ -40,28 +28,28 @@ def split_bundle(input_path, out_root='data', dry_run=False):
         print(f'Expected top-level object in {input_path}', file=sys.stderr)
         return 1
 
-    written = []
-    for lang, content in data.items():
-        if not isinstance(content, dict):
-            print(f'Skipping language "{lang}": expected object, got {type(content).__name__}')
-            continue
-        lang_dir = os.path.join(out_root, lang)
-        if dry_run:
-            print(f'[dry-run] would ensure directory: {lang_dir}')
-        else:
-            os.makedirs(lang_dir, exist_ok=True)
-
-        for section_key, section_value in content.items():
-            out_path = os.path.join(lang_dir, f"{section_key}.json")
-            payload = {section_key: section_value}
+    # Files whose content did not change are not rewritten (mtime preserved)
+    with JsonBatchWriter() as writer:
+        for lang, content in data.items():
+            if not isinstance(content, dict):
+                print(f'Skipping language "{lang}": expected object, got {type(content).__name__}')
+                continue
+            lang_dir = os.path.join(out_root, lang)
             if dry_run:
-                print(f'[dry-run] would write: {out_path}')
+                print(f'[dry-run] would ensure directory: {lang_dir}')
             else:
-                write_json(out_path, payload)
-                written.append(out_path)
-
-    print(f'Done. Files written: {len(written)}')
-    for p in written:
+                os.makedirs(lang_dir, exist_ok=True)
+
+            for section_key, section_value in content.items():
+                out_path = os.path.join(lang_dir, f"{section_key}.json")
+                payload = {section_key: section_value}
+                if dry_run:
+                    print(f'[dry-run] would write: {out_path}')
+                else:
+                    writer.submit(out_path, payload)
+
+    print(f'Done. Files {writer.summary()}')
+    for p in writer.written:
         print(' -', p)
     return 0
 
@@ -14,24 +14,11 @@ Usage:
   python3 scripts/split_projects.py --input data/portfolio.json
 """
 import argparse
-import json
 import os
 import sys
 from typing import Dict, List
 
-
-def load_json(path):
-    with open(path, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-
-def write_json(path, data):
-    tmp = path + '.tmp'
-    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
-    with open(tmp, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-        f.write('\n')
-    os.replace(tmp, path)
+from json_io import JsonBatchWriter, load_json
 
 
 def split_projects(portfolio_path: str, out_dir: str = 'data/projects', bundle_path: str = 'data/projects.json') -> int:
@@ -48,26 +35,30 @@ def split_projects(portfolio_path: str, out_dir: str = 'data/projects', bundle_p
     # Collect per-language project lists from written per-project files
     bundle: Dict[str, Dict[str, List]] = {}
 
-    for lang, lang_content in langs.items():
-        projects = lang_content.get('projects', []) if isinstance(lang_content, dict) else []
-        out_list = []
-        for proj in projects:
-            # Each project should have an `id` (recommended). Fall back to slug if missing.
-            pid = proj.get('id') or proj.get('slug')
-            if pid is None:
-                print(f'Warning: project in {lang} missing id and slug; skipping', file=sys.stderr)
-                continue
-
-            fname = os.path.join(out_dir, f"{pid}-{lang}.json")
-            write_json(fname, proj)
-            out_list.append(proj)
-            print('Wrote per-project file:', fname)
-
-        bundle[lang] = {'projects': out_list}
-
-    # Write bundle file
-    write_json(bundle_path, bundle)
-    print('Wrote bundle:', bundle_path)
+    # Files whose content did not change are not rewritten (mtime preserved)
+    with JsonBatchWriter() as writer:
+        for lang, lang_content in langs.items():
+            projects = lang_content.get('projects', []) if isinstance(lang_content, dict) else []
+            out_list = []
+            for proj in projects:
+                # Each project should have an `id` (recommended). Fall back to slug if missing.
+                pid = proj.get('id') or proj.get('slug')
+                if pid is None:
+                    print(f'Warning: project in {lang} missing id and slug; skipping', file=sys.stderr)
+                    continue
+
+                fname = os.path.join(out_dir, f"{pid}-{lang}.json")
+                writer.submit(fname, proj)
+                out_list.append(proj)
+
+            bundle[lang] = {'projects': out_list}
+
+        # Write bundle file
+        writer.submit(bundle_path, bundle)
+
+    for fname in writer.written:
+        print('Wrote:', fname)
+    print(f'Done. Files {writer.summary()} (bundle: {bundle_path})')
     return 0
 
 
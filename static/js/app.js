@@ -252,8 +252,13 @@ document.addEventListener('DOMContentLoaded', () => {
                         if (isVideoUrl(v)) return `<video src="${v}" muted loop onmouseover="this.play()" onmouseout="this.pause()" onerror="this.outerHTML='<img src=\\'${placeholder}\\' alt=\\'${proj.title}\\' loading=\\'lazy\\' />'"></video>`;
                         if (isImageUrl(v)) return `<img src="${v}" alt="${proj.title}" loading="lazy" onerror="this.onerror=null;this.src='${placeholder}';">`;
                     }
-                    const firstImg = proj.images?.[0]?.img_path;
-                    if (firstImg) return `<img src="${firstImg}" alt="${proj.title}" loading="lazy" onerror="this.onerror=null;this.src='${placeholder}';">`;
+                    const firstImg = proj.preview_image || proj.images?.[0]?.img_path;
+                    if (firstImg) {
+                        // Dimensiones calculadas en build (ver scripts/media_meta.py); el placeholder
+                        // LQIP no se incluye en site-data para no repetirlo en todas las páginas
+                        const dims = (proj.preview_width && proj.preview_height) ? ` width="${proj.preview_width}" height="${proj.preview_height}"` : '';
+                        return `<img src="${firstImg}" alt="${proj.title}"${dims} loading="lazy" decoding="async" onerror="this.onerror=null;this.src='${placeholder}';">`;
+                    }
                     return `<img src="${placeholder}" alt="${proj.title}" loading="lazy">`;
                 })()}
             </div>
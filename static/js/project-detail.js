@@ -97,14 +97,23 @@ document.addEventListener('DOMContentLoaded', () => {
         const placeholderSvg = '<svg xmlns="http://www.w3.org/2000/svg" width="1200" height="675"><rect width="100%" height="100%" fill="#f3f4f6"/><text x="50%" y="50%" dominant-baseline="middle" text-anchor="middle" fill="#9ca3af" font-family="Arial, sans-serif" font-size="36">No media available</text></svg>';
         const placeholder = 'data:image/svg+xml;utf8,' + encodeURIComponent(placeholderSvg);
 
+        // Atributos de dimensiones intrínsecas + placeholder (calculados en build) para evitar layout shift
+        const mediaAttrs = (w, h, lqip) => {
+            let attrs = '';
+            if (w && h) attrs += ` width="${w}" height="${h}"`;
+            if (lqip) attrs += ` style="background-image:url('${lqip}')"`;
+            return attrs;
+        };
+        const lqipClass = (lqip) => lqip ? ' lqip' : '';
+
         const items = [];
 
         // presentación: puede ser video o imagen vía `project.video_url`
         if (project.video_url) {
             if (isVideoUrl(project.video_url)) {
-                items.push(`<figure class="detail-item"><video src="${project.video_url}" controls class="img-expanded" onerror="this.outerHTML='<img src=\"${placeholder}\" class=\"img-expanded\"/>'"></video><figcaption class="media-overlay">${project.title}</figcaption></figure>`);
+                items.push(`<figure class="detail-item"><video src="${project.video_url}" controls preload="metadata" class="img-expanded"${mediaAttrs(project.video_width, project.video_height)} onerror="this.outerHTML='<img src=\"${placeholder}\" class=\"img-expanded\"/>'"></video><figcaption class="media-overlay">${project.title}</figcaption></figure>`);
             } else if (isImageUrl(project.video_url)) {
-                items.push(`<figure class="detail-item"><img src="${project.video_url}" alt="${project.title}" class="img-expanded" onerror="this.onerror=null;this.src='${placeholder}';"><figcaption class="media-overlay">${project.title}</figcaption></figure>`);
+                items.push(`<figure class="detail-item"><img src="${project.video_url}" alt="${project.title}" class="img-expanded${lqipClass(project.video_placeholder)}"${mediaAttrs(project.video_width, project.video_height, project.video_placeholder)} decoding="async" onerror="this.onerror=null;this.src='${placeholder}';"><figcaption class="media-overlay">${project.title}</figcaption></figure>`);
             }
         }
 
@@ -113,7 +122,7 @@ document.addEventListener('DOMContentLoaded', () => {
             project.images.forEach(img => {
                 if (img && img.img_path) {
                     const caption = img.caption || project.title || '';
-                    items.push(`<figure class="detail-item"><img src="${img.img_path}" alt="${caption}" class="img-expanded" onerror="this.onerror=null;this.src='${placeholder}';"><figcaption class="media-overlay">${caption}</figcaption></figure>`);
+                    items.push(`<figure class="detail-item"><img src="${img.img_path}" alt="${caption}" class="img-expanded${lqipClass(img.placeholder)}"${mediaAttrs(img.width, img.height, img.placeholder)} loading="lazy" decoding="async" onerror="this.onerror=null;this.src='${placeholder}';"><figcaption class="media-overlay">${caption}</figcaption></figure>`);
                 }
             });
         }